@@ -3,18 +3,22 @@ import logging
 from pydantic import ValidationError
 from quart import Quart, ResponseReturnValue
 from quart_schema import Info, QuartSchema, RequestSchemaValidationError, Tag, hide
-from sqlalchemy import select
 
 from chat_service.config import settings
-from chat_service.model import async_session
-from chat_service.routes import bp
+from chat_service.routes import STORAGE_BACKEND_EXTENSION, bp
+from chat_service.storage import StorageBackend, create_storage_backend
 
 logger = logging.getLogger(__name__)
 
 
-def create_app() -> Quart:
+def create_app(storage_backend: StorageBackend | None = None) -> Quart:
+    """Create the app. If no storage backend is given, the configured one is used."""
     app = Quart(__name__)
 
+    if storage_backend is None:
+        storage_backend = create_storage_backend(settings.storage)
+    app.extensions[STORAGE_BACKEND_EXTENSION] = storage_backend
+
     # setup quart schema to provide API documentation
     QuartSchema(
         app,
@@ -50,8 +54,7 @@ def create_app() -> Quart:
     @hide
     async def health_check() -> ResponseReturnValue:
         """Health check endpoint"""
-        async with async_session() as session:
-            await session.execute(select(1))
+        await storage_backend.ping()
         return "Healthy"
 
     return app
@@ -1,5 +1,7 @@
 """Configuration module for the application using typed settings."""
 
+from typing import Literal
+
 import typed_settings
 
 
@@ -16,10 +18,16 @@ class Database:
     echo: bool
 
 
+@typed_settings.settings
+class Storage:
+    backend: Literal["sql", "memory"]
+
+
 @typed_settings.settings
 class Settings:
     quart: Quart
     database: Database
+    storage: Storage
     base_path: str
 
     default_message: str
@@ -1,14 +1,58 @@
 """The data model for the chat messages."""
 
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
+from sqlalchemy import DateTime
 from sqlalchemy import Enum as SQLAlchemyEnum
-from sqlalchemy import func
+from sqlalchemy import Index, func
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
 
 from chat_service.schema import AuthorType
 
+# SQLite stores timestamps as text and its CURRENT_TIMESTAMP has no fractional seconds. Bound timestamps have to be
+# rendered the same way, otherwise comparing them with stored ones (e.g. for keyset pagination) is off on ties.
+_SQLITE_TIMESTAMP_FORMAT = (
+    "%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+ServerTimestamp = DateTime().with_variant(
+    sqlite.DATETIME(storage_format=_SQLITE_TIMESTAMP_FORMAT),  # type: ignore[no-untyped-call]
+    "sqlite",
+)
+
+
+class statement_timestamp(FunctionElement[datetime]):
+    """
+    The time the current statement started.
+
+    On Postgres, CURRENT_TIMESTAMP is the time the transaction started. Concurrent updates of the same row are then
+    applied in an order their timestamps do not reflect: an update waiting on the row lock of a later transaction would
+    overwrite the row with an earlier timestamp. statement_timestamp() does not have this issue, since the waiting
+    statement only starts after the one holding the lock. Other databases fall back to CURRENT_TIMESTAMP.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(statement_timestamp)
+def _compile_statement_timestamp(
+    element: statement_timestamp, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(statement_timestamp, "postgresql")
+def _compile_statement_timestamp_postgresql(
+    element: statement_timestamp, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return "statement_timestamp()"
+
 
 class Base(DeclarativeBase):
     pass
@@ -23,3 +67,31 @@ class ChatMessage(Base):
     author_type: Mapped[AuthorType] = mapped_column(SQLAlchemyEnum(AuthorType))
 
     session_id: Mapped[UUID]
+
+
+class ChatSessionState(Base):
+    """
+    The latest state of a chat session, kept up to date whenever a message is added.
+
+    This allows answering questions about the last message of a session (e.g. for the agent inbox) without having to
+    aggregate over all messages in `chat_messages`.
+    """
+
+    __tablename__ = "chat_session_states"
+    __table_args__ = (
+        # supports the inbox query: filter by last author, keyset pagination over (last_activity_at, session_id)
+        Index(
+            "ix_chat_session_states_inbox",
+            "last_author_type",
+            "last_activity_at",
+            "session_id",
+        ),
+    )
+
+    session_id: Mapped[UUID] = mapped_column(primary_key=True)
+    last_author_type: Mapped[AuthorType] = mapped_column(SQLAlchemyEnum(AuthorType))
+    # the time of the last message, except for follow up messages of a customer: for a session awaiting a reply, this is
+    # the time of the first customer message since the last reply, i.e. since when the customer waits
+    last_activity_at: Mapped[datetime] = mapped_column(
+        ServerTimestamp, server_default=func.current_timestamp()
+    )
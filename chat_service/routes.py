@@ -4,24 +4,39 @@ from http import HTTPStatus
 from typing import Literal
 from uuid import UUID
 
-from quart import Blueprint
-from quart_schema import tag, validate_request, validate_response
-from werkzeug.exceptions import NotFound
+from quart import Blueprint, current_app
+from quart_schema import tag, validate_querystring, validate_request, validate_response
+from werkzeug.exceptions import BadRequest, NotFound
 
-from chat_service.model import async_session
-from chat_service.services import ChatSessionManager, SessionNotFoundError
-from chat_service.transport import ChatSessionResponse, PostMessageRequest
+from chat_service.schema import InboxCursor
+from chat_service.services import ChatSessionManager
+from chat_service.storage import SessionNotFoundError, StorageBackend
+from chat_service.transport import (
+    ChatSessionResponse,
+    InboxQuery,
+    InboxResponse,
+    PostMessageRequest,
+)
 
 bp = Blueprint("messages", __name__)
 
+# the key of the storage backend in the extensions of the app
+STORAGE_BACKEND_EXTENSION = "chat_service.storage_backend"
+
+
+def _storage_backend() -> StorageBackend:
+    """The storage backend of the current app."""
+    storage_backend: StorageBackend = current_app.extensions[STORAGE_BACKEND_EXTENSION]
+    return storage_backend
+
 
 @tag(["Chat"])
 @bp.post("/sessions")
 @validate_response(ChatSessionResponse)
 async def create_session() -> tuple[ChatSessionResponse, Literal[HTTPStatus.CREATED]]:
     """Create a new chat session."""
-    async with async_session.begin() as session:
-        chat_session_manager = ChatSessionManager(session)
+    async with _storage_backend().begin() as storage:
+        chat_session_manager = ChatSessionManager(storage)
         chat_session = await chat_session_manager.create_new_session()
 
         return chat_session, HTTPStatus.CREATED
@@ -32,8 +47,8 @@ async def create_session() -> tuple[ChatSessionResponse, Literal[HTTPStatus.CREA
 @validate_response(ChatSessionResponse)
 async def get_session(session_id: UUID) -> ChatSessionResponse:
     """Retrieve an existing chat session with all its messages."""
-    async with async_session.begin() as session:
-        chat_session_manager = ChatSessionManager(session)
+    async with _storage_backend().begin() as storage:
+        chat_session_manager = ChatSessionManager(storage)
         try:
             return await chat_session_manager.get_session(session_id)
         except SessionNotFoundError:
@@ -51,8 +66,8 @@ async def send_message(
 
     This will return the whole session with all its messages.
     """
-    async with async_session.begin() as session:
-        chat_session_manager = ChatSessionManager(session)
+    async with _storage_backend().begin() as storage:
+        chat_session_manager = ChatSessionManager(storage)
         try:
             chat_session = await chat_session_manager.add_message_to_session(
                 session_id=session_id,
@@ -63,3 +78,24 @@ async def send_message(
             raise NotFound(f"Session {session_id} was not found.")
 
         return chat_session, HTTPStatus.CREATED
+
+
+@tag(["Chat"])
+@bp.get("/inbox")
+@validate_querystring(InboxQuery)
+@validate_response(InboxResponse)
+async def get_inbox(query_args: InboxQuery) -> InboxResponse:
+    """Retrieve the sessions awaiting a reply from a service agent, the longest waiting first.
+
+    The result is paginated: pass the `next_cursor` of a page as `cursor` to retrieve the next one.
+    """
+    try:
+        cursor = InboxCursor.decode(query_args.cursor) if query_args.cursor else None
+    except ValueError:
+        raise BadRequest(f"Invalid cursor {query_args.cursor}")
+
+    async with _storage_backend().begin() as storage:
+        chat_session_manager = ChatSessionManager(storage)
+        return await chat_session_manager.get_inbox(
+            limit=query_args.limit, cursor=cursor
+        )
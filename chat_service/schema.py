@@ -1,6 +1,12 @@
 """Shared internal data types."""
 
+from __future__ import annotations
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
 from enum import StrEnum, auto
+from typing import NamedTuple
+from uuid import UUID
 
 
 class AuthorType(StrEnum):
@@ -8,3 +14,36 @@ class AuthorType(StrEnum):
 
     CUSTOMER = auto()
     SERVICE_AGENT = auto()
+
+
+class InboxCursor(NamedTuple):
+    """
+    A keyset pagination cursor for the agent inbox, pointing at the last session of a page.
+
+    It is handed to clients as an opaque url safe string.
+    """
+
+    last_activity_at: datetime
+    session_id: UUID
+
+    def encode(self) -> str:
+        """Encode the cursor as an opaque string."""
+        raw = f"{self.last_activity_at.isoformat()}|{self.session_id}"
+        return urlsafe_b64encode(raw.encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> InboxCursor:
+        """Decode a cursor from its opaque string representation. This will fail with a ValueError if it is invalid."""
+        # ValueError covers invalid base64, encoding, number of parts, timestamp (incl. time zone) and uuid
+        try:
+            last_activity_at, session_id = (
+                urlsafe_b64decode(cursor.encode()).decode().split("|")
+            )
+            timestamp = datetime.fromisoformat(last_activity_at)
+            if timestamp.tzinfo is not None:
+                raise ValueError(
+                    "The timestamp of the cursor must not have a time zone"
+                )
+            return cls(timestamp, UUID(session_id))
+        except ValueError as e:
+            raise ValueError(f"Invalid cursor {cursor!r}") from e
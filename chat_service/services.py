@@ -2,18 +2,10 @@
 
 from uuid import UUID, uuid4
 
-from sqlalchemy import exists, select
-from sqlalchemy.ext.asyncio import AsyncSession
-
 from chat_service.config import settings
-from chat_service.model.chat import ChatMessage
-from chat_service.schema import AuthorType
-from chat_service.transport import ChatSessionResponse
-
-
-class SessionNotFoundError(Exception):
-    def __init__(self, session_id: UUID) -> None:
-        super().__init__(f"Session {session_id} not found")
+from chat_service.schema import AuthorType, InboxCursor
+from chat_service.storage import ChatStorage, SessionNotFoundError
+from chat_service.transport import ChatSessionResponse, InboxResponse
 
 
 class ChatSessionManager:
@@ -21,21 +13,18 @@ class ChatSessionManager:
     A chat session manager class that acts as a helper to create and retrieve chat sessions and to send messages to it.
     """
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
+    def __init__(self, storage: ChatStorage):
+        self.storage = storage
 
     async def create_new_session(self) -> ChatSessionResponse:
         """Create a new chat session by creating the initial default message."""
         new_session_id = uuid4()
-        first_message = ChatMessage(
-            id=uuid4(),
+        await self.storage.add_session(
             session_id=new_session_id,
-            content=settings.default_message,
+            message_id=uuid4(),
+            message_content=settings.default_message,
             author_type=AuthorType.SERVICE_AGENT,
         )
-        self.session.add(first_message)
-
-        await self.session.flush()
 
         return await self.get_session(new_session_id)
 
@@ -47,21 +36,12 @@ class ChatSessionManager:
 
         This will fail with a SessionNotFoundError if the session does not exist.
         """
-        exists_query = select(1).where(
-            exists().where(ChatMessage.session_id == session_id)
-        )
-        if not (await self.session.scalar(exists_query)):
-            raise SessionNotFoundError(session_id)
-
-        new_message = ChatMessage(
-            id=uuid4(),
+        await self.storage.add_message(
             session_id=session_id,
-            content=message_content,
+            message_id=uuid4(),
+            message_content=message_content,
             author_type=author_type,
         )
-        self.session.add(new_message)
-
-        await self.session.flush()
 
         return await self.get_session(session_id)
 
@@ -71,9 +51,26 @@ class ChatSessionManager:
 
         This will fail with a SessionNotFoundError if the session does not exist.
         ."""
-        query = select(ChatMessage).where(ChatMessage.session_id == session_id)
-        result = await self.session.scalars(query)
-        messages = result.all()
+        messages = await self.storage.get_messages(session_id)
         if not messages:
             raise SessionNotFoundError(session_id)
         return ChatSessionResponse.from_chat_messages(messages)
+
+    async def get_inbox(
+        self, limit: int, cursor: InboxCursor | None = None
+    ) -> InboxResponse:
+        """
+        Get the sessions awaiting a reply from a service agent, i.e. whose last message came from a customer.
+
+        The sessions are ordered by the time of their last activity, the longest waiting first. Pagination is keyset
+        based: pass the cursor of the previous page to continue after its last session.
+        """
+        # fetch one more to know whether there is a next page
+        states = await self.storage.get_sessions_awaiting_reply(limit + 1, cursor)
+
+        next_cursor = None
+        if len(states) > limit:
+            states = states[:limit]
+            last = states[-1]
+            next_cursor = InboxCursor(last.last_activity_at, last.session_id).encode()
+        return InboxResponse.from_session_states(states, next_cursor)
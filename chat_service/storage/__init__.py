@@ -0,0 +1,33 @@
+"""The storage backends for chat sessions."""
+
+from chat_service.config import Storage
+from chat_service.model import async_session
+from chat_service.storage.base import (
+    ChatStorage,
+    MessageRecord,
+    SessionNotFoundError,
+    SessionStateRecord,
+    StorageBackend,
+)
+from chat_service.storage.memory import InMemoryStorageBackend
+from chat_service.storage.sql import SqlStorageBackend
+
+__all__ = [
+    "ChatStorage",
+    "InMemoryStorageBackend",
+    "MessageRecord",
+    "SessionNotFoundError",
+    "SessionStateRecord",
+    "SqlStorageBackend",
+    "StorageBackend",
+    "create_storage_backend",
+]
+
+
+def create_storage_backend(config: Storage) -> StorageBackend:
+    """Create the storage backend as configured."""
+    match config.backend:
+        case "sql":
+            return SqlStorageBackend(async_session)
+        case "memory":
+            return InMemoryStorageBackend()
@@ -0,0 +1,103 @@
+"""The interface every storage backend for chat sessions has to implement."""
+
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime
+from typing import Protocol, Sequence
+from uuid import UUID
+
+from chat_service.schema import AuthorType, InboxCursor
+
+
+class SessionNotFoundError(Exception):
+    def __init__(self, session_id: UUID) -> None:
+        super().__init__(f"Session {session_id} not found")
+
+
+class MessageRecord(Protocol):
+    """A stored chat message."""
+
+    @property
+    def session_id(self) -> UUID: ...
+
+    @property
+    def timestamp(self) -> datetime: ...
+
+    @property
+    def content(self) -> str: ...
+
+    @property
+    def author_type(self) -> AuthorType: ...
+
+
+class SessionStateRecord(Protocol):
+    """The stored latest state of a chat session."""
+
+    @property
+    def session_id(self) -> UUID: ...
+
+    @property
+    def last_author_type(self) -> AuthorType: ...
+
+    @property
+    def last_activity_at(self) -> datetime:
+        """
+        The time of the last message, except for follow up messages of a customer.
+
+        For a session awaiting a reply, this is the time of the first customer message since the last reply.
+        """
+
+
+class ChatStorage(ABC):
+    """Access to the stored chat sessions within a single unit of work."""
+
+    @abstractmethod
+    async def add_session(
+        self,
+        session_id: UUID,
+        message_id: UUID,
+        message_content: str,
+        author_type: AuthorType,
+    ) -> None:
+        """Store a new chat session together with its first message."""
+
+    @abstractmethod
+    async def add_message(
+        self,
+        session_id: UUID,
+        message_id: UUID,
+        message_content: str,
+        author_type: AuthorType,
+    ) -> None:
+        """
+        Store a new message in an existing session and update the state of the session accordingly.
+
+        This will fail with a SessionNotFoundError if the session does not exist.
+        """
+
+    @abstractmethod
+    async def get_messages(self, session_id: UUID) -> Sequence[MessageRecord]:
+        """Get all messages of a session. This is empty if the session does not exist."""
+
+    @abstractmethod
+    async def get_sessions_awaiting_reply(
+        self, limit: int, cursor: InboxCursor | None = None
+    ) -> Sequence[SessionStateRecord]:
+        """
+        Get up to `limit` sessions whose last message came from a customer.
+
+        The sessions are ordered by (last_activity_at, session_id). If a cursor is given, only the sessions after it
+        are returned.
+        """
+
+
+class StorageBackend(ABC):
+    """A storage backend for chat sessions."""
+
+    @abstractmethod
+    def begin(self) -> AbstractAsyncContextManager[ChatStorage]:
+        """Begin a unit of work. Its changes are committed when the context is exited without an error."""
+
+    @abstractmethod
+    async def ping(self) -> None:
+        """Check that the storage is available. This will fail if it is not."""
@@ -0,0 +1,168 @@
+"""
+A storage backend keeping chat sessions in memory.
+
+It is meant for local development, load tests and profiling, where it allows to isolate the overhead of the
+application from the one of the database. The data is neither persisted nor shared between processes.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import AsyncIterator, Sequence
+from uuid import UUID
+
+from chat_service.schema import AuthorType, InboxCursor
+from chat_service.storage.base import ChatStorage, SessionNotFoundError, StorageBackend
+
+
+def _utcnow() -> datetime:
+    """The current timestamp as naive UTC timestamp, like the ones returned by the database."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class InMemoryMessage:
+    """A chat message stored in memory."""
+
+    __slots__ = ("id", "session_id", "timestamp", "content", "author_type")
+
+    def __init__(
+        self,
+        id: UUID,
+        session_id: UUID,
+        timestamp: datetime,
+        content: str,
+        author_type: AuthorType,
+    ) -> None:
+        self.id = id
+        self.session_id = session_id
+        self.timestamp = timestamp
+        self.content = content
+        self.author_type = author_type
+
+
+class InMemorySession:
+    """A chat session stored in memory, i.e. its latest state and its append-only list of messages."""
+
+    __slots__ = ("session_id", "last_author_type", "last_activity_at", "messages")
+
+    def __init__(
+        self,
+        session_id: UUID,
+        last_author_type: AuthorType,
+        last_activity_at: datetime,
+        messages: list[InMemoryMessage],
+    ) -> None:
+        self.session_id = session_id
+        self.last_author_type = last_author_type
+        self.last_activity_at = last_activity_at
+        self.messages = messages
+
+    @property
+    def inbox_key(self) -> tuple[datetime, UUID]:
+        return self.last_activity_at, self.session_id
+
+
+class InMemoryChatStorage(ChatStorage):
+    """
+    Access to the chat sessions stored in memory.
+
+    Changes are applied immediately and are not rolled back if the unit of work fails.
+    """
+
+    def __init__(
+        self,
+        sessions: dict[UUID, InMemorySession],
+        inbox: list[tuple[datetime, UUID]],
+    ):
+        self.sessions = sessions
+        self.inbox = inbox
+
+    async def add_session(
+        self,
+        session_id: UUID,
+        message_id: UUID,
+        message_content: str,
+        author_type: AuthorType,
+    ) -> None:
+        now = _utcnow()
+        message = InMemoryMessage(
+            id=message_id,
+            session_id=session_id,
+            timestamp=now,
+            content=message_content,
+            author_type=author_type,
+        )
+        session = InMemorySession(
+            session_id=session_id,
+            last_author_type=author_type,
+            last_activity_at=now,
+            messages=[message],
+        )
+        self.sessions[session_id] = session
+        if author_type == AuthorType.CUSTOMER:
+            insort(self.inbox, session.inbox_key)
+
+    async def add_message(
+        self,
+        session_id: UUID,
+        message_id: UUID,
+        message_content: str,
+        author_type: AuthorType,
+    ) -> None:
+        try:
+            session = self.sessions[session_id]
+        except KeyError:
+            raise SessionNotFoundError(session_id)
+
+        now = _utcnow()
+        session.messages.append(
+            InMemoryMessage(
+                id=message_id,
+                session_id=session_id,
+                timestamp=now,
+                content=message_content,
+                author_type=author_type,
+            )
+        )
+
+        # a follow up message of a waiting customer must not move the session back in the inbox
+        if (
+            author_type == AuthorType.CUSTOMER
+            and session.last_author_type == AuthorType.CUSTOMER
+        ):
+            return
+
+        # keep the inbox, which is sorted by (last_activity_at, session_id), up to date
+        if session.last_author_type == AuthorType.CUSTOMER:
+            del self.inbox[bisect_left(self.inbox, session.inbox_key)]
+        session.last_author_type = author_type
+        session.last_activity_at = now
+        if author_type == AuthorType.CUSTOMER:
+            insort(self.inbox, session.inbox_key)
+
+    async def get_messages(self, session_id: UUID) -> Sequence[InMemoryMessage]:
+        session = self.sessions.get(session_id)
+        return session.messages if session is not None else []
+
+    async def get_sessions_awaiting_reply(
+        self, limit: int, cursor: InboxCursor | None = None
+    ) -> Sequence[InMemorySession]:
+        start = bisect_right(self.inbox, cursor) if cursor is not None else 0
+        end = start + limit
+        return [self.sessions[session_id] for _, session_id in self.inbox[start:end]]
+
+
+class InMemoryStorageBackend(StorageBackend):
+    """A storage backend keeping chat sessions in memory."""
+
+    def __init__(self) -> None:
+        self.sessions: dict[UUID, InMemorySession] = {}
+        # the keys of the sessions awaiting a reply, sorted by (last_activity_at, session_id)
+        self.inbox: list[tuple[datetime, UUID]] = []
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[InMemoryChatStorage]:
+        yield InMemoryChatStorage(self.sessions, self.inbox)
+
+    async def ping(self) -> None:
+        pass
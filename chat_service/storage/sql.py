@@ -0,0 +1,131 @@
+"""The storage backend persisting chat sessions to a relational database through SQLAlchemy."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, case, literal, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from chat_service.model.chat import (
+    ChatMessage,
+    ChatSessionState,
+    statement_timestamp,
+)
+from chat_service.schema import AuthorType, InboxCursor
+from chat_service.storage.base import ChatStorage, SessionNotFoundError, StorageBackend
+
+
+class SqlChatStorage(ChatStorage):
+    """Access to the chat sessions stored in the database within a single database transaction."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_session(
+        self,
+        session_id: UUID,
+        message_id: UUID,
+        message_content: str,
+        author_type: AuthorType,
+    ) -> None:
+        self.session.add(
+            ChatMessage(
+                id=message_id,
+                session_id=session_id,
+                content=message_content,
+                author_type=author_type,
+            )
+        )
+        self.session.add(
+            ChatSessionState(session_id=session_id, last_author_type=author_type)
+        )
+
+        await self.session.flush()
+
+    async def add_message(
+        self,
+        session_id: UUID,
+        message_id: UUID,
+        message_content: str,
+        author_type: AuthorType,
+    ) -> None:
+        # see statement_timestamp for why the transaction time (CURRENT_TIMESTAMP on Postgres) is not used here
+        last_activity_at: ColumnElement[datetime] = statement_timestamp()
+        # a follow up message of a waiting customer must not move the session back in the inbox
+        if author_type == AuthorType.CUSTOMER:
+            last_activity_at = case(
+                (
+                    ChatSessionState.last_author_type == AuthorType.CUSTOMER,
+                    ChatSessionState.last_activity_at,
+                ),
+                else_=last_activity_at,
+            )
+
+        # keeping the session state up to date doubles as the existence check of the session
+        update_state_query = (
+            update(ChatSessionState)
+            .where(ChatSessionState.session_id == session_id)
+            .values(last_author_type=author_type, last_activity_at=last_activity_at)
+            .returning(ChatSessionState.session_id)
+        )
+        if (await self.session.scalar(update_state_query)) is None:
+            raise SessionNotFoundError(session_id)
+
+        self.session.add(
+            ChatMessage(
+                id=message_id,
+                session_id=session_id,
+                content=message_content,
+                author_type=author_type,
+            )
+        )
+
+        await self.session.flush()
+
+    async def get_messages(self, session_id: UUID) -> Sequence[ChatMessage]:
+        query = select(ChatMessage).where(ChatMessage.session_id == session_id)
+        result = await self.session.scalars(query)
+        return result.all()
+
+    async def get_sessions_awaiting_reply(
+        self, limit: int, cursor: InboxCursor | None = None
+    ) -> Sequence[ChatSessionState]:
+        sort_key = tuple_(
+            ChatSessionState.last_activity_at, ChatSessionState.session_id
+        )
+        query = (
+            select(ChatSessionState)
+            .where(ChatSessionState.last_author_type == AuthorType.CUSTOMER)
+            .order_by(ChatSessionState.last_activity_at, ChatSessionState.session_id)
+            .limit(limit)
+        )
+        if cursor is not None:
+            # bind the cursor with the column types, so it is rendered like the stored values
+            cursor_key = tuple_(
+                literal(
+                    cursor.last_activity_at, ChatSessionState.last_activity_at.type
+                ),
+                literal(cursor.session_id, ChatSessionState.session_id.type),
+            )
+            query = query.where(sort_key > cursor_key)
+
+        result = await self.session.scalars(query)
+        return result.all()
+
+
+class SqlStorageBackend(StorageBackend):
+    """A storage backend persisting chat sessions to a relational database."""
+
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
+        self.sessionmaker = sessionmaker
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[SqlChatStorage]:
+        async with self.sessionmaker.begin() as session:
+            yield SqlChatStorage(session)
+
+    async def ping(self) -> None:
+        async with self.sessionmaker() as session:
+            await session.execute(select(1))
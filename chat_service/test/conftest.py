@@ -0,0 +1,31 @@
+from typing import Iterator
+
+import pytest
+from alembic.command import downgrade, upgrade
+from alembic.config import Config
+
+from chat_service.model import async_session
+from chat_service.storage import (
+    InMemoryStorageBackend,
+    SqlStorageBackend,
+    StorageBackend,
+)
+
+
+@pytest.fixture
+def migrated_db() -> Iterator[None]:
+    """Apply all migrations to the database"""
+    alembic_config = Config(file_="alembic.ini")
+    downgrade(alembic_config, "base")
+    upgrade(alembic_config, "head")
+    yield
+    downgrade(alembic_config, "base")
+
+
+@pytest.fixture(params=["sql", "memory"])
+def storage_backend(request: pytest.FixtureRequest) -> StorageBackend:
+    """A fresh instance of each storage backend"""
+    if request.param == "sql":
+        request.getfixturevalue("migrated_db")
+        return SqlStorageBackend(async_session)
+    return InMemoryStorageBackend()
@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Iterator
+from uuid import UUID
+
+import pytest
+from alembic.command import downgrade, upgrade
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, insert, select
+
+from chat_service.config import settings
+from chat_service.model.chat import ChatMessage, ChatSessionState
+from chat_service.schema import AuthorType
+
+CUSTOMER = AuthorType.CUSTOMER
+SERVICE_AGENT = AuthorType.SERVICE_AGENT
+
+
+@pytest.fixture
+def alembic_config() -> Iterator[Config]:
+    alembic_config = Config(file_="alembic.ini")
+    downgrade(alembic_config, "base")
+    yield alembic_config
+    downgrade(alembic_config, "base")
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    """A synchronous engine for the database, as used by the migrations"""
+    engine = create_engine(
+        settings.database.uri.replace("+asyncpg", "").replace("+aiosqlite", "")
+    )
+    yield engine
+    engine.dispose()
+
+
+def at(minute: int) -> datetime:
+    return datetime(2024, 1, 1, 10, minute)
+
+
+def test_session_states_are_backfilled_from_existing_messages(
+    alembic_config: Config, engine: Engine
+) -> None:
+    upgrade(alembic_config, "9018b4fb75f3")
+
+    # per session: the messages as (timestamp, author type) in the order of their ids
+    messages = {
+        UUID(int=1): [(at(0), SERVICE_AGENT)],
+        UUID(int=2): [(at(0), SERVICE_AGENT), (at(1), CUSTOMER)],
+        # a follow up message of a waiting customer does not change the wait time
+        UUID(int=3): [(at(0), SERVICE_AGENT), (at(1), CUSTOMER), (at(2), CUSTOMER)],
+        UUID(int=4): [
+            (at(0), SERVICE_AGENT),
+            (at(1), CUSTOMER),
+            (at(2), SERVICE_AGENT),
+        ],
+        # the wait time starts with the first customer message after the last reply
+        UUID(int=5): [
+            (at(0), CUSTOMER),
+            (at(1), SERVICE_AGENT),
+            (at(2), CUSTOMER),
+            (at(3), CUSTOMER),
+        ],
+        # ties on the timestamp are broken by the message id
+        UUID(int=6): [(at(0), SERVICE_AGENT), (at(0), CUSTOMER)],
+        UUID(int=7): [(at(0), CUSTOMER), (at(0), SERVICE_AGENT)],
+    }
+    message_id = 0
+    with engine.begin() as connection:
+        for session_id, session_messages in messages.items():
+            for timestamp, author_type in session_messages:
+                message_id += 1
+                connection.execute(
+                    insert(ChatMessage).values(
+                        id=UUID(int=message_id),
+                        session_id=session_id,
+                        timestamp=timestamp,
+                        content="Some message.",
+                        author_type=author_type,
+                    )
+                )
+
+    upgrade(alembic_config, "head")
+
+    with engine.connect() as connection:
+        states = connection.execute(
+            select(
+                ChatSessionState.session_id,
+                ChatSessionState.last_author_type,
+                ChatSessionState.last_activity_at,
+            ).order_by(ChatSessionState.session_id)
+        ).all()
+
+    assert [tuple(state) for state in states] == [
+        (UUID(int=1), SERVICE_AGENT, at(0)),
+        (UUID(int=2), CUSTOMER, at(1)),
+        (UUID(int=3), CUSTOMER, at(1)),
+        (UUID(int=4), SERVICE_AGENT, at(2)),
+        (UUID(int=5), CUSTOMER, at(2)),
+        (UUID(int=6), CUSTOMER, at(0)),
+        (UUID(int=7), SERVICE_AGENT, at(0)),
+    ]
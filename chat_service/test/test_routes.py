@@ -1,21 +1,21 @@
+from base64 import urlsafe_b64encode
 from http import HTTPStatus
-from typing import Callable, Iterator
+from typing import Callable
 from unittest.mock import ANY, Mock
 from uuid import UUID
 
 import pytest
-from alembic.command import downgrade, upgrade
-from alembic.config import Config
 from pytest_mock import MockerFixture
 from quart import Quart
 from quart.testing import QuartClient
 
 from chat_service.app import create_app
+from chat_service.storage import StorageBackend
 
 
 @pytest.fixture
-def app() -> Quart:
-    app = create_app()
+def app(storage_backend: StorageBackend) -> Quart:
+    app = create_app(storage_backend)
     return app
 
 
@@ -24,16 +24,6 @@ def client(app: Quart) -> QuartClient:
     return app.test_client()  # type: ignore
 
 
-@pytest.fixture(autouse=True)
-def migrated_db() -> Iterator[None]:
-    """Apply all migrations to the database"""
-    alembic_config = Config(file_="alembic.ini")
-    downgrade(alembic_config, "base")
-    upgrade(alembic_config, "head")
-    yield
-    downgrade(alembic_config, "base")
-
-
 @pytest.fixture()
 def mock_uuid(mocker: MockerFixture) -> Mock:
     mock = mocker.patch("chat_service.services.uuid4", autospec=True)
@@ -183,3 +173,102 @@ async def test_retrieving_an_inexistent_session_yields_a_404(
 ) -> None:
     response = await client.get("/sessions/00000000-0000-0000-0000-000000000000")
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+async def test_inbox_contains_sessions_whose_last_message_came_from_a_customer(
+    client: QuartClient, mock_uuid: Mock
+) -> None:
+    # all sessions are created with a default message by a service agent
+    first_session_id, second_session_id, third_session_id, agent_only_session_id = [
+        (await (await client.post("/sessions")).json)["id"] for _ in range(4)
+    ]
+
+    # a customer writes to the first and the third session...
+    for session_id in [first_session_id, third_session_id]:
+        response = await client.post(
+            f"/sessions/{session_id}/messages",
+            json={"content": "I have an issue.", "author_type": "customer"},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+    # ...and to the second session, but already got a reply
+    for author_type in ["customer", "service_agent"]:
+        response = await client.post(
+            f"/sessions/{second_session_id}/messages",
+            json={"content": "Some message.", "author_type": author_type},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    response = await client.get("/inbox")
+
+    assert response.status_code == HTTPStatus.OK
+    assert (await response.json) == {
+        "sessions": [
+            {"session_id": first_session_id, "last_activity_at": ANY},
+            {"session_id": third_session_id, "last_activity_at": ANY},
+        ],
+        "next_cursor": None,
+    }
+
+
+async def test_inbox_is_paginated(client: QuartClient, mock_uuid: Mock) -> None:
+    session_ids = []
+    for _ in range(5):
+        session_id = (await (await client.post("/sessions")).json)["id"]
+        response = await client.post(
+            f"/sessions/{session_id}/messages",
+            json={"content": "I have an issue.", "author_type": "customer"},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        session_ids.append(session_id)
+
+    paginated_session_ids = []
+    cursor = None
+    for _ in range(3):
+        query_string = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = await client.get("/inbox", query_string=query_string)
+        assert response.status_code == HTTPStatus.OK
+        page = await response.json
+        paginated_session_ids += [s["session_id"] for s in page["sessions"]]
+        cursor = page["next_cursor"]
+
+    assert paginated_session_ids == session_ids
+    assert cursor is None
+
+
+async def test_inbox_cursor_of_an_earlier_page_can_be_reused(
+    client: QuartClient, mock_uuid: Mock
+) -> None:
+    session_ids = []
+    for _ in range(3):
+        session_id = (await (await client.post("/sessions")).json)["id"]
+        response = await client.post(
+            f"/sessions/{session_id}/messages",
+            json={"content": "I have an issue.", "author_type": "customer"},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        session_ids.append(session_id)
+
+    first_page = await (await client.get("/inbox", query_string={"limit": 1})).json
+    cursor = first_page["next_cursor"]
+    for _ in range(2):
+        response = await client.get(
+            "/inbox", query_string={"limit": 1, "cursor": cursor}
+        )
+        assert response.status_code == HTTPStatus.OK
+        second_page = await response.json
+        assert [s["session_id"] for s in second_page["sessions"]] == session_ids[1:2]
+
+
+async def test_inbox_with_an_invalid_cursor_yields_a_400(client: QuartClient) -> None:
+    response = await client.get("/inbox", query_string={"cursor": "invalid"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+async def test_inbox_with_a_cursor_with_a_time_zone_yields_a_400(
+    client: QuartClient,
+) -> None:
+    cursor = urlsafe_b64encode(
+        b"2024-01-01T10:00:00+00:00|00000000-0000-0000-0000-000000000000"
+    ).decode()
+    response = await client.get("/inbox", query_string={"cursor": cursor})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,181 @@
+"""A conformance test suite which every storage backend has to pass."""
+
+from itertools import count
+from operator import attrgetter
+from typing import Iterator
+from uuid import UUID, uuid4
+
+import pytest
+
+from chat_service.schema import AuthorType, InboxCursor
+from chat_service.storage import SessionNotFoundError, StorageBackend
+
+
+@pytest.fixture
+def session_ids() -> Iterator[UUID]:
+    """
+    Ascending session ids.
+
+    The database might store the same timestamp for activities within the same second (e.g. SQLite's CURRENT_TIMESTAMP
+    has no fractional seconds). Such sessions are ordered by their id, so creating them with ascending ids keeps the
+    expected order stable.
+    """
+    return (UUID(int=i) for i in count(1))
+
+
+async def create_session(
+    storage_backend: StorageBackend,
+    session_ids: Iterator[UUID],
+    author_type: AuthorType = AuthorType.SERVICE_AGENT,
+) -> UUID:
+    session_id = next(session_ids)
+    async with storage_backend.begin() as storage:
+        await storage.add_session(
+            session_id=session_id,
+            message_id=uuid4(),
+            message_content="Hello, how may I help you?",
+            author_type=author_type,
+        )
+    return session_id
+
+
+async def add_message(
+    storage_backend: StorageBackend, session_id: UUID, author_type: AuthorType
+) -> None:
+    async with storage_backend.begin() as storage:
+        await storage.add_message(
+            session_id=session_id,
+            message_id=uuid4(),
+            message_content="Some message.",
+            author_type=author_type,
+        )
+
+
+async def get_sessions_awaiting_reply(
+    storage_backend: StorageBackend, limit: int = 10, cursor: InboxCursor | None = None
+) -> list[UUID]:
+    async with storage_backend.begin() as storage:
+        states = await storage.get_sessions_awaiting_reply(limit, cursor)
+        return [s.session_id for s in states]
+
+
+async def test_ping(storage_backend: StorageBackend) -> None:
+    await storage_backend.ping()
+
+
+async def test_add_session_stores_the_first_message(
+    storage_backend: StorageBackend, session_ids: Iterator[UUID]
+) -> None:
+    session_id = await create_session(storage_backend, session_ids)
+
+    async with storage_backend.begin() as storage:
+        messages = await storage.get_messages(session_id)
+
+    assert len(messages) == 1
+    assert messages[0].session_id == session_id
+    assert messages[0].content == "Hello, how may I help you?"
+    assert messages[0].author_type == AuthorType.SERVICE_AGENT
+
+
+async def test_add_message_appends_to_the_session(
+    storage_backend: StorageBackend, session_ids: Iterator[UUID]
+) -> None:
+    session_id = await create_session(storage_backend, session_ids)
+    other_session_id = await create_session(storage_backend, session_ids)
+
+    await add_message(storage_backend, session_id, AuthorType.CUSTOMER)
+    await add_message(storage_backend, session_id, AuthorType.SERVICE_AGENT)
+
+    async with storage_backend.begin() as storage:
+        messages = sorted(
+            await storage.get_messages(session_id), key=attrgetter("timestamp")
+        )
+        other_messages = await storage.get_messages(other_session_id)
+
+    assert [m.author_type for m in messages] == [
+        AuthorType.SERVICE_AGENT,
+        AuthorType.CUSTOMER,
+        AuthorType.SERVICE_AGENT,
+    ]
+    assert len(other_messages) == 1
+
+
+async def test_add_message_to_an_inexistent_session_fails(
+    storage_backend: StorageBackend,
+) -> None:
+    with pytest.raises(SessionNotFoundError):
+        await add_message(storage_backend, uuid4(), AuthorType.CUSTOMER)
+
+
+async def test_get_messages_of_an_inexistent_session_is_empty(
+    storage_backend: StorageBackend,
+) -> None:
+    async with storage_backend.begin() as storage:
+        assert not await storage.get_messages(uuid4())
+
+
+async def test_sessions_awaiting_reply_are_ordered_by_wait_time(
+    storage_backend: StorageBackend, session_ids: Iterator[UUID]
+) -> None:
+    # the sessions are created in their expected order, see session_ids
+    started_by_customer = await create_session(
+        storage_backend, session_ids, AuthorType.CUSTOMER
+    )
+    first, second, third, answered, reopened = [
+        await create_session(storage_backend, session_ids) for _ in range(5)
+    ]
+
+    await add_message(storage_backend, first, AuthorType.CUSTOMER)
+    await add_message(storage_backend, reopened, AuthorType.CUSTOMER)
+    await add_message(storage_backend, answered, AuthorType.CUSTOMER)
+    await add_message(storage_backend, second, AuthorType.CUSTOMER)
+    await add_message(storage_backend, third, AuthorType.CUSTOMER)
+    await add_message(storage_backend, answered, AuthorType.SERVICE_AGENT)
+    await add_message(storage_backend, reopened, AuthorType.SERVICE_AGENT)
+    # a new customer message after a reply moves the session to the back...
+    await add_message(storage_backend, reopened, AuthorType.CUSTOMER)
+    # ...but a follow up message of a waiting customer keeps its place
+    await add_message(storage_backend, first, AuthorType.CUSTOMER)
+
+    assert await get_sessions_awaiting_reply(storage_backend) == [
+        started_by_customer,
+        first,
+        second,
+        third,
+        reopened,
+    ]
+
+
+async def test_follow_up_message_keeps_the_wait_time(
+    storage_backend: StorageBackend, session_ids: Iterator[UUID]
+) -> None:
+    session_id = await create_session(storage_backend, session_ids)
+    await add_message(storage_backend, session_id, AuthorType.CUSTOMER)
+    async with storage_backend.begin() as storage:
+        [state] = await storage.get_sessions_awaiting_reply(limit=10)
+        waiting_since = state.last_activity_at
+
+    await add_message(storage_backend, session_id, AuthorType.CUSTOMER)
+
+    async with storage_backend.begin() as storage:
+        [state] = await storage.get_sessions_awaiting_reply(limit=10)
+        assert state.last_activity_at == waiting_since
+        assert len(await storage.get_messages(session_id)) == 3
+
+
+async def test_sessions_awaiting_reply_are_paginated(
+    storage_backend: StorageBackend, session_ids: Iterator[UUID]
+) -> None:
+    created_session_ids = [
+        await create_session(storage_backend, session_ids, AuthorType.CUSTOMER)
+        for _ in range(5)
+    ]
+
+    async with storage_backend.begin() as storage:
+        first_page = await storage.get_sessions_awaiting_reply(limit=2)
+        last = first_page[-1]
+        cursor = InboxCursor(last.last_activity_at, last.session_id)
+        second_page = await storage.get_sessions_awaiting_reply(limit=10, cursor=cursor)
+
+    assert [s.session_id for s in first_page] == created_session_ids[:2]
+    assert [s.session_id for s in second_page] == created_session_ids[2:]
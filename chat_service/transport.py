@@ -9,8 +9,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from chat_service.model.chat import ChatMessage
 from chat_service.schema import AuthorType
+from chat_service.storage.base import MessageRecord, SessionStateRecord
 
 # request models
 
@@ -24,6 +24,21 @@ class PostMessageRequest(BaseModel):
     content: str = Field(description="The content of the message.")
 
 
+class InboxQuery(BaseModel):
+    """The query parameters for retrieving the agent inbox."""
+
+    limit: int = Field(
+        default=50,
+        ge=1,
+        le=100,
+        description="The maximum number of sessions to return.",
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="The `next_cursor` of the previous page. If omitted, the first page is returned.",
+    )
+
+
 # response models
 
 
@@ -56,7 +71,9 @@ class ChatSessionResponse(_ResponseBaseModel):
     )
 
     @classmethod
-    def from_chat_messages(cls, messages: Sequence[ChatMessage]) -> ChatSessionResponse:
+    def from_chat_messages(
+        cls, messages: Sequence[MessageRecord]
+    ) -> ChatSessionResponse:
         """Instantiate a session response from a list of chat messages. This will fail if no messages are provided."""
         if not messages:
             raise ValueError("No messages received")
@@ -71,9 +88,36 @@ class ChatSessionResponse(_ResponseBaseModel):
             messages=message_responses,
         )
 
-    def add_message(self, message: ChatMessage) -> None:
+    def add_message(self, message: MessageRecord) -> None:
         """Add a chat message to the messages in this session."""
         new_message = MessageResponse.model_validate(message)
         self.messages = sorted(
             self.messages + [new_message], key=attrgetter("timestamp")
         )
+
+
+class InboxSessionResponse(_ResponseBaseModel):
+    session_id: UUID
+    last_activity_at: datetime = Field(
+        description="The server side timestamp of the first customer message since the last reply. "
+        "The session awaits a reply since then."
+    )
+
+
+class InboxResponse(_ResponseBaseModel):
+    sessions: list[InboxSessionResponse] = Field(
+        description="The sessions awaiting a reply, the longest waiting first."
+    )
+    next_cursor: str | None = Field(
+        description="A cursor to retrieve the next page. This is null if there are no further sessions."
+    )
+
+    @classmethod
+    def from_session_states(
+        cls, states: Sequence[SessionStateRecord], next_cursor: str | None
+    ) -> InboxResponse:
+        """Instantiate an inbox response from a page of chat session states."""
+        return cls(
+            sessions=[InboxSessionResponse.model_validate(s) for s in states],
+            next_cursor=next_cursor,
+        )
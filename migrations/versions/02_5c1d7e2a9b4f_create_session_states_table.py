@@ -0,0 +1,94 @@
+"""Creation of the session state table backing the agent inbox.
+
+Revision ID: 5c1d7e2a9b4f
+Revises: 9018b4fb75f3
+Create Date: 2026-10-19 10:12:44.218113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d7e2a9b4f"
+down_revision: Union[str, None] = "9018b4fb75f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_session_states",
+        sa.Column("session_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "last_author_type",
+            # the enum type has already been created along with the chat_messages table
+            postgresql.ENUM(
+                "CUSTOMER", "SERVICE_AGENT", name="authortype", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "last_activity_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("session_id"),
+    )
+    op.create_index(
+        "ix_chat_session_states_inbox",
+        "chat_session_states",
+        ["last_author_type", "last_activity_at", "session_id"],
+        unique=False,
+    )
+
+    # backfill the state of existing sessions in a single pass over chat_messages: the last author of a session and,
+    # for sessions awaiting a reply, the first customer message since the last reply (otherwise the last message)
+    op.execute(
+        """
+        INSERT INTO chat_session_states (session_id, last_author_type, last_activity_at)
+        SELECT
+            latest.session_id,
+            latest.author_type,
+            CASE
+                WHEN latest.author_type = 'CUSTOMER' THEN COALESCE(latest.waiting_since, latest.timestamp)
+                ELSE latest.timestamp
+            END
+        FROM (
+            SELECT
+                r.session_id,
+                r.author_type,
+                r.timestamp,
+                r.position,
+                MIN(
+                    CASE
+                        WHEN r.author_type = 'CUSTOMER' AND (r.last_reply_at IS NULL OR r.timestamp > r.last_reply_at)
+                        THEN r.timestamp
+                    END
+                ) OVER (PARTITION BY r.session_id) AS waiting_since
+            FROM (
+                SELECT
+                    m.session_id,
+                    m.author_type,
+                    m.timestamp,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY m.session_id ORDER BY m.timestamp DESC, m.id DESC
+                    ) AS position,
+                    MAX(CASE WHEN m.author_type = 'SERVICE_AGENT' THEN m.timestamp END) OVER (
+                        PARTITION BY m.session_id
+                    ) AS last_reply_at
+                FROM chat_messages m
+            ) r
+        ) latest
+        WHERE latest.position = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_session_states_inbox", table_name="chat_session_states")
+    op.drop_table("chat_session_states")